@@ -1,17 +1,156 @@
-import qrcode
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import groupby, repeat
 import os
+import sys
 
-screen_name = f"qrcode{0}.png"
-dirCurrent = os.getcwd()
-print("put your website to create qrCode: ", end='')
-user_data = input()
+from qrcode import QRCode, constants
 
-qr = qrcode.QRCode(
+NAME_TMPL = "qrcode{}.{}".format
+
+# numba saves ~0.5ms per code but costs ~0.5s to import, so only workers
+# with at least this many urls compile it
+JIT_MIN_PER_WORKER = 1000
+
+# one QRCode is reused for every input instead of being rebuilt per url
+qr = QRCode(
         version=1,
         box_size=10,
-        border=5)
-qr.add_data(user_data)
-qr.make(fit=True)
-img = qr.make_image(fill='black', back_color='white')
-img.save(screen_name)
-print("created!")
\ No newline at end of file
+        border=5,
+        error_correction=constants.ERROR_CORRECT_L)
+
+
+def _save_png(modules, out):
+    # rasterize the whole matrix at once instead of drawing one rectangle
+    # per dark module; PIL (and numpy, if present) are only needed for --png
+    from PIL import Image
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is None:
+        # Pillow only: one pixel per module, then scale up by box_size
+        size = len(modules) + 2 * qr.border
+        small = Image.new("1", (len(modules), len(modules)))
+        small.putdata([0 if dark else 255 for row in modules for dark in row])
+        img = Image.new("1", (size, size), 255)
+        img.paste(small, (qr.border, qr.border))
+        pixels = size * qr.box_size
+        img.resize((pixels, pixels), Image.NEAREST).save(out, format="PNG")
+        return
+
+    m = np.pad(np.asarray(modules, dtype=np.uint8), qr.border)
+    block = np.ones((qr.box_size, qr.box_size), dtype=np.uint8)
+    big = np.kron(1 - m, block).astype(bool)
+    Image.fromarray(big).save(out, format="PNG")
+
+
+def _save_svg(modules, out):
+    # a single <path> string, one subpath per run of dark modules; no
+    # raster to paint or zlib pass
+    size = len(modules) + 2 * qr.border
+    mm = f"{size * qr.box_size / 10:g}mm"
+    path = []
+    for y, row in enumerate(modules, qr.border):
+        x = qr.border
+        for dark, run in groupby(row):
+            n = sum(1 for _ in run)
+            if dark:
+                path.append(f"M{x},{y}h{n}v1h-{n}z")
+            x += n
+    with open(out, "w", encoding="utf-8") as f:
+        f.write(
+            "<?xml version='1.0' encoding='UTF-8'?>\n"
+            f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+            f'width="{mm}" height="{mm}" viewBox="0 0 {size} {size}">'
+            f'<path d="{"".join(path)}" fill="#000000" stroke="none"/></svg>\n')
+
+
+@lru_cache(maxsize=256)
+def _encode(url):
+    try:
+        qr.clear()
+        # make(fit=True) only grows the version, start from 1 again for each url
+        qr.version = 1
+        qr.add_data(url)
+        qr.make(fit=True)
+        return tuple(map(tuple, qr.modules))
+    finally:
+        # never leave a failed url's data behind in the shared instance
+        qr.clear()
+
+
+def generate(url, out, png=False):
+    # render from the cached matrix only, nothing reads qr after _encode()
+    modules = _encode(url)
+    if png:
+        _save_png(modules, out)
+    else:
+        _save_svg(modules, out)
+
+
+def _generate_one(url, out, png):
+    # a bad url must not take the rest of its batch down with it
+    try:
+        generate(url, out, png)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def _report(linenos, outs, errors):
+    failed = 0
+    for lineno, out, error in zip(linenos, outs, errors):
+        if error is None:
+            print("created!")
+        else:
+            failed += 1
+            print(f"line {lineno} ({out} not created): {error}",
+                  file=sys.stderr)
+    return failed
+
+
+if __name__ == "__main__":
+    png = "--png" in sys.argv[1:]
+    ext = "png" if png else "svg"
+    if sys.stdin.isatty():
+        print("put your website to create qrCode: ", end='')
+        lines = [input()]
+        if not lines[0].strip():
+            sys.exit("no website given, nothing created")
+    else:
+        # piped input: one read of the whole stream, no per-line wrapper work
+        lines = sys.stdin.buffer.read().decode().splitlines()
+    numbered = [(n, line.strip()) for n, line in enumerate(lines, 1)
+                if line.strip()]
+    linenos = [n for n, _ in numbered]
+    urls = [url for _, url in numbered]
+    outs = [NAME_TMPL(i, ext) for i in range(len(urls))]
+    if len(urls) > 1:
+        # encoding is CPU-bound pure python, so spread it over processes;
+        # each worker writes its own file and only returns an error or None
+        workers = os.cpu_count() or 1
+        # about 4 chunks per worker: small batches still use every core,
+        # large ones don't pay IPC per url
+        chunksize = max(1, len(urls) // (workers * 4))
+        initializer, initargs = None, ()
+        try:
+            import qrcode_fast
+        except ImportError:
+            # qrcode_fast needs numpy; keep the stock qrcode functions
+            pass
+        else:
+            # the bit-parallel mask scan is always worth installing, the
+            # numba compile only above the size threshold
+            initializer = qrcode_fast.patch
+            initargs = (len(urls) >= JIT_MIN_PER_WORKER * workers,)
+        with ProcessPoolExecutor(workers, initializer=initializer,
+                                 initargs=initargs) as ex:
+            errors = ex.map(_generate_one, urls, outs, repeat(png),
+                            chunksize=chunksize)
+            failed = _report(linenos, outs, errors)
+    else:
+        errors = map(_generate_one, urls, outs, repeat(png))
+        failed = _report(linenos, outs, errors)
+    sys.exit(1 if failed else 0)
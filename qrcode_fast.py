@@ -0,0 +1,177 @@
+"""
+Compiled replacements for the hot loops of the qrcode library.
+
+patch() swaps them into qrcode.util / qrcode.base; importing this module
+alone changes nothing. numba is only imported and compiled by
+patch(jit=True). Without it the mask penalty still gets a bit-parallel
+run scan and the polynomial division is left to the library.
+"""
+import numpy as np
+from qrcode import base, util
+
+EXP_TABLE = np.array(base.EXP_TABLE, dtype=np.int16)
+LOG_TABLE = np.array(base.LOG_TABLE, dtype=np.int16)
+
+_jit = False
+
+
+def _runs_penalty(m):
+    # rule 1: every run of 5+ same-colored modules in a row
+    n = m.shape[0]
+    lost = 0
+    for r in range(n):
+        length = 1
+        for c in range(1, n):
+            if m[r, c] == m[r, c - 1]:
+                length += 1
+            else:
+                if length >= 5:
+                    lost += length - 2
+                length = 1
+        if length >= 5:
+            lost += length - 2
+    return lost
+
+
+def _blocks_penalty(m):
+    # rule 2: 2x2 blocks of one color
+    n = m.shape[0]
+    lost = 0
+    for r in range(n - 1):
+        c = 0
+        while c < n - 1:
+            top_right = m[r, c + 1]
+            if top_right != m[r + 1, c + 1]:
+                c += 2
+                continue
+            if top_right == m[r, c] and top_right == m[r + 1, c]:
+                lost += 3
+            c += 1
+    return lost
+
+
+def _finder_penalty(m):
+    # rule 3: 1:1:3:1:1 finder-like pattern with 4 light modules on one side
+    n = m.shape[0]
+    lost = 0
+    for r in range(n):
+        c = 0
+        while c < n - 10:
+            if (
+                not m[r, c + 1]
+                and m[r, c + 4]
+                and not m[r, c + 5]
+                and m[r, c + 6]
+                and not m[r, c + 9]
+                and (
+                    m[r, c]
+                    and m[r, c + 2]
+                    and m[r, c + 3]
+                    and not m[r, c + 7]
+                    and not m[r, c + 8]
+                    and not m[r, c + 10]
+                    or not m[r, c]
+                    and not m[r, c + 2]
+                    and not m[r, c + 3]
+                    and m[r, c + 7]
+                    and m[r, c + 8]
+                    and m[r, c + 10]
+                )
+            ):
+                lost += 40
+            c += 2 if m[r, c + 10] else 1
+    return lost
+
+
+def _lost_point(m):
+    n = m.shape[0]
+    lost = _runs_penalty(m) + _runs_penalty(m.T)
+    lost += _blocks_penalty(m)
+    lost += _finder_penalty(m) + _finder_penalty(m.T)
+    # rule 4: every 5% departure from 50% dark modules
+    percent = m.sum() / (n * n)
+    lost += int(abs(percent * 100 - 50) / 5) * 10
+    return lost
+
+
+def _poly_mod(num, other):
+    num = num.copy()
+    start = 0
+    while True:
+        # drop leading zero terms, as Polynomial() does
+        while start < len(num) - 1 and num[start] == 0:
+            start += 1
+        if len(num) - start < len(other):
+            return num[start:]
+        ratio = LOG_TABLE[num[start]] - LOG_TABLE[other[0]]
+        for i in range(len(other)):
+            num[start + i] ^= EXP_TABLE[(LOG_TABLE[other[i]] + ratio) % 255]
+
+
+def _popcount(x):
+    return bin(x).count("1")
+
+
+def _pack(m):
+    # all rows of m in one int, n + 1 bits per row so that the zero
+    # separator bit stops runs from joining across rows
+    padded = np.zeros((m.shape[0], m.shape[1] + 1), dtype=np.uint8)
+    padded[:, :-1] = m
+    return int.from_bytes(np.packbits(padded, bitorder="little").tobytes(), "little")
+
+
+def _swar_runs(bits):
+    five = bits & bits >> 1 & bits >> 2 & bits >> 3 & bits >> 4
+    # a run of length L >= 5 leaves L - 4 bits set in `five` and costs L - 2
+    return _popcount(five) + 2 * _popcount(five & ~(five << 1))
+
+
+def _runs_penalty_swar(m):
+    lost = 0
+    for grid in (m, m.T):
+        lost += _swar_runs(_pack(grid)) + _swar_runs(_pack(1 - grid))
+    return lost
+
+
+def _compile():
+    global _runs_penalty, _blocks_penalty, _finder_penalty, _lost_point
+    global _poly_mod, _jit
+    from numba import njit
+
+    _runs_penalty = njit(cache=True)(_runs_penalty)
+    _blocks_penalty = njit(cache=True)(_blocks_penalty)
+    _finder_penalty = njit(cache=True)(_finder_penalty)
+    _lost_point = njit(cache=True)(_lost_point)
+    _poly_mod = njit(cache=True)(_poly_mod)
+    _jit = True
+
+
+def lost_point(modules):
+    m = np.array(modules, dtype=np.uint8)
+    if _jit:
+        return _lost_point(m)
+    n = len(modules)
+    return (
+        _runs_penalty_swar(m)
+        + util._lost_point_level2(modules, n)
+        + util._lost_point_level3(modules, n)
+        + util._lost_point_level4(modules, n)
+    )
+
+
+def polynomial_mod(self, other):
+    num = _poly_mod(
+        np.array(self.num, dtype=np.int16), np.array(other.num, dtype=np.int16)
+    )
+    return base.Polynomial(num.tolist(), 0)
+
+
+def patch(jit=True):
+    if jit and not _jit:
+        try:
+            _compile()
+        except ImportError:
+            pass
+    util.lost_point = lost_point
+    if _jit:
+        base.Polynomial.__mod__ = polynomial_mod